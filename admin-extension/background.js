@@ -15,10 +15,24 @@ const LOCAL_STATE_DEFAULT = {
 	registeredUsername: null
 };
 
+// Settings only change through the options page, so keep the last read in memory
+// and drop it whenever chrome.storage reports a sync change.
+let settingsCache = null;
+
 async function getSettings() {
-	return chrome.storage.sync.get(DEFAULT_SETTINGS);
+	if (!settingsCache) {
+		settingsCache = chrome.storage.sync.get(DEFAULT_SETTINGS).catch((error) => {
+			settingsCache = null;
+			throw error;
+		});
+	}
+	return settingsCache;
 }
 
+chrome.storage.onChanged.addListener((changes, area) => {
+	if (area === 'sync') settingsCache = null;
+});
+
 async function getLocalState() {
 	return chrome.storage.local.get(LOCAL_STATE_DEFAULT);
 }
@@ -54,6 +68,34 @@ function withTimeout(promise, timeoutMs, message) {
 	]);
 }
 
+// Transient Worker/edge failures on reads are retried with backoff instead of surfacing as
+// errors. Writes are sent once: a repeated POST could deliver a share twice.
+const RETRY_STATUSES = new Set([502, 503, 504]);
+const RETRY_DELAYS_MS = [200, 400, 800];
+
+function sleep(ms) {
+	return new Promise((resolve) => setTimeout(resolve, ms));
+}
+
+async function fetchWithRetry(url, options) {
+	const method = (options.method || "GET").toUpperCase();
+	const attempts = method === "GET" ? RETRY_DELAYS_MS.length + 1 : 1;
+	for (let attempt = 1; ; attempt++) {
+		try {
+			const response = await withTimeout(fetch(url, options), API_TIMEOUT_MS, "API request timed out.");
+			if (attempt >= attempts || !RETRY_STATUSES.has(response.status)) {
+				return response;
+			}
+		} catch (error) {
+			// fetch() rejects with TypeError on network failure; timeouts are not retried.
+			if (attempt >= attempts || !(error instanceof TypeError)) {
+				throw error;
+			}
+		}
+		await sleep(RETRY_DELAYS_MS[attempt - 1]);
+	}
+}
+
 async function apiFetch(baseUrl, path, options = {}) {
 	const url = `${baseUrl.replace(/\/+$/, "")}${path}`;
 	const mergedOptions = Object.assign(
@@ -65,7 +107,7 @@ async function apiFetch(baseUrl, path, options = {}) {
 		options
 	);
 
-	const response = await withTimeout(fetch(url, mergedOptions), API_TIMEOUT_MS, "API request timed out.");
+	const response = await fetchWithRetry(url, mergedOptions);
 	const contentType = response.headers.get("content-type") || "";
 	const parseJson = () => (contentType.includes("application/json") ? response.json() : response.text());
 
@@ -91,8 +133,31 @@ async function notify(title, message) {
 	} catch (_) {}
 }
 
+// Install, the options page and the share path can all ask to register; share one in-flight
+// registration so they don't race two POSTs (and two authSecrets) for a new user.
+let registrationInFlight = null;
+
 async function registerIdentityIfNeeded() {
-	const settings = await getSettings();
+	// Read storage directly: the options page saves and then messages us, and that message can
+	// arrive before storage.onChanged clears the settings cache.
+	const settings = await chrome.storage.sync.get(DEFAULT_SETTINGS);
+	const key = `${settings.serverBaseUrl || DEFAULT_SERVER_BASE_URL}|${settings.currentUsername?.trim() || ""}`;
+	const current = registrationInFlight;
+	if (current && current.key === key) {
+		return current.promise;
+	}
+	// Settings changed since the in-flight registration started: register again once it settles.
+	const previous = current ? current.promise.catch(() => {}) : Promise.resolve();
+	const promise = previous.then(() => registerIdentity(settings)).finally(() => {
+		if (registrationInFlight?.promise === promise) {
+			registrationInFlight = null;
+		}
+	});
+	registrationInFlight = { key, promise };
+	return promise;
+}
+
+async function registerIdentity(settings) {
 	const username = settings.currentUsername?.trim();
 	if (!username) {
 		throw new Error("Set your username in extension options.");
@@ -195,9 +260,11 @@ async function handleShareSession(payload) {
 		throw new Error("No active tab found.");
 	}
 
-	const sessionData = await captureSessionData(tab);
-
-	const recipientRecord = await apiFetch(baseUrl, `/v1/users/${encodeURIComponent(payload.recipientUsername)}`);
+	// The recipient key lookup does not depend on the captured data, so run both together.
+	const [sessionData, recipientRecord] = await Promise.all([
+		captureSessionData(tab),
+		apiFetch(baseUrl, `/v1/users/${encodeURIComponent(payload.recipientUsername)}`)
+	]);
 	const cipherBundle = await encryptPayload({
 		payload: sessionData,
 		senderPrivateJwk: state.identityPrivateKey,
@@ -245,8 +312,10 @@ chrome.runtime.onMessage.addListener((message, sender, sendResponse) => {
 	return undefined;
 });
 
+// Warm the identity off the share path: register if a username is set, otherwise
+// at least generate the keypair so the first share only has to register.
 chrome.runtime.onInstalled.addListener(() => {
-	registerIdentityIfNeeded().catch(() => {});
+	registerIdentityIfNeeded().catch(() => ensureIdentity()).catch(() => {});
 });
 
 // Simple periodic poll for pending requests and notify admin
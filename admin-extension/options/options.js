@@ -25,6 +25,30 @@ async function saveLocalHistory(items) {
   await chrome.storage.local.set({ [HISTORY_KEY]: items });
 }
 
+// Back-to-back refreshes (button clicks, the reload after saving settings) within a few
+// seconds share one GET /v1/sessions. Terminate/remove drop the cached result.
+const SESSIONS_TTL_MS = 3000;
+let sessionsCache = null;
+
+function fetchServerSessions(url) {
+  const now = Date.now();
+  if (sessionsCache && sessionsCache.url === url && now - sessionsCache.at < SESSIONS_TTL_MS) {
+    return sessionsCache.promise;
+  }
+  const promise = fetch(url).then(async (resp) => (resp.ok ? ((await resp.json()).sessions || []) : null));
+  sessionsCache = { url, at: now, promise };
+  // Never keep a failed lookup around; the next refresh should retry.
+  const dropIfCurrent = () => {
+    if (sessionsCache?.promise === promise) sessionsCache = null;
+  };
+  promise.then((sessions) => { if (!sessions) dropIfCurrent(); }, dropIfCurrent);
+  return promise;
+}
+
+function invalidateSessionsCache() {
+  sessionsCache = null;
+}
+
 function mergeHistory(localItems, serverItems) {
   const map = new Map(localItems.map((s) => [s.id, s]));
   for (const s of serverItems || []) {
@@ -38,22 +62,24 @@ function mergeHistory(localItems, serverItems) {
   return Array.from(map.values()).sort((a, b) => new Date(b.createdAt).getTime() - new Date(a.createdAt).getTime());
 }
 
+// Intl formatters are costly to construct; the history list formats one time per row.
+const relativeTimeFormatter = new Intl.RelativeTimeFormat(undefined, { numeric: "auto" });
+const RELATIVE_TIME_UNITS = [
+  { unit: "day", ms: 86400000 },
+  { unit: "hour", ms: 3600000 },
+  { unit: "minute", ms: 60000 },
+  { unit: "second", ms: 1000 }
+];
+
 function formatRelativeTime(isoDate) {
   if (!isoDate) {
     return "unknown time";
   }
-  const formatter = new Intl.RelativeTimeFormat(undefined, { numeric: "auto" });
   const diffMs = Date.now() - new Date(isoDate).getTime();
-  const units = [
-    { unit: "day", ms: 86400000 },
-    { unit: "hour", ms: 3600000 },
-    { unit: "minute", ms: 60000 },
-    { unit: "second", ms: 1000 }
-  ];
-  for (const { unit, ms } of units) {
+  for (const { unit, ms } of RELATIVE_TIME_UNITS) {
     const value = Math.round(diffMs / ms);
     if (Math.abs(value) >= 1) {
-      return formatter.format(-value, unit);
+      return relativeTimeFormatter.format(-value, unit);
     }
   }
   return "just now";
@@ -61,29 +87,21 @@ function formatRelativeTime(isoDate) {
 
 function renderHistory(items) {
   const container = document.getElementById("history-list");
-  container.innerHTML = "";
   if (!items?.length) {
     container.textContent = "No shares yet.";
     return;
   }
-  const list = document.createElement("ul");
-  list.style.listStyle = "none";
-  list.style.padding = "0";
-  list.style.margin = "12px 0 0";
-  items.forEach((session) => {
-    const li = document.createElement("li");
-    li.style.padding = "6px 0";
-    li.style.borderBottom = "1px dashed #dadce0";
+  // Build the whole list as one string so the DOM is parsed and laid out once, not per row.
+  const rows = items.map((session) => {
     const isExpired = session.expiresAt && (new Date(session.expiresAt).getTime() < Date.now());
     const status = session.revokedAt ? "revoked" : (isExpired ? "expired" : (session.acceptedAt ? "accepted" : "pending"));
     const link = session.url || (session.targetOrigin ? `${session.targetOrigin}${session.targetPath || '/'}` : '');
     const linkHtml = link ? ` • <a href="${link}" target="_blank" class="mono">${link}</a>` : '';
     const terminateBtn = session.revokedAt ? '' : ` <button class="small terminate" data-id="${session.id}">Terminate</button>`;
     const deleteBtn = ` <button class="small delete" data-id="${session.id}">Remove</button>`;
-    li.innerHTML = `<strong>${session.recipient}</strong>${linkHtml} • ${formatRelativeTime(session.createdAt)} • <span class="hint">${status}</span>${terminateBtn}${deleteBtn}`;
-    list.appendChild(li);
+    return `<li style="padding:6px 0;border-bottom:1px dashed #dadce0"><strong>${session.recipient}</strong>${linkHtml} • ${formatRelativeTime(session.createdAt)} • <span class="hint">${status}</span>${terminateBtn}${deleteBtn}</li>`;
   });
-  container.appendChild(list);
+  container.innerHTML = `<ul style="list-style:none;padding:0;margin:12px 0 0">${rows.join("")}</ul>`;
 }
 
 function setStatus(message, isError = false) {
@@ -130,10 +148,9 @@ async function loadHistory() {
     const base = settings.serverBaseUrl || DEFAULT_SERVER_BASE_URL;
     const authSecret = (await chrome.storage.local.get({ authSecret: null }))?.authSecret;
     const url = `${base.replace(/\/+$/, '')}/v1/sessions?sender=${encodeURIComponent(username)}&authSecret=${encodeURIComponent(authSecret || '')}&limit=100`;
-    const resp = await fetch(url);
-    if (!resp.ok) return; // Keep local if server fails
-    const data = await resp.json();
-    const merged = mergeHistory(local, data.sessions || []);
+    const sessions = await fetchServerSessions(url);
+    if (!sessions) return; // Keep local if server fails
+    const merged = mergeHistory(local, sessions);
     await saveLocalHistory(merged);
     renderHistory(merged);
   } catch (error) {
@@ -192,6 +209,7 @@ window.addEventListener("DOMContentLoaded", () => {
         const resp = await fetch(`${base.replace(/\/+$/, '')}/v1/sessions/${encodeURIComponent(id)}/revoke`, {
           method: 'POST', headers: { 'content-type': 'application/json' }, body: JSON.stringify({ username, authSecret })
         });
+        invalidateSessionsCache();
         // Even if server fails (404/410), we still keep the item locally; just refresh view
         if (!resp.ok) console.warn('Terminate failed with status', resp.status);
         // Update local status to revoked
@@ -230,6 +248,7 @@ window.addEventListener("DOMContentLoaded", () => {
             method: 'POST', headers: { 'content-type': 'application/json' }, body: JSON.stringify({ username, authSecret })
           });
         } catch (_) {}
+        invalidateSessionsCache();
         dbtn.textContent = 'Removed';
         setTimeout(() => { dbtn.textContent = prev; dbtn.disabled = false; }, 600);
       } catch (err) {
@@ -19,10 +19,24 @@ const LOCAL_STATE_DEFAULT = {
 const processedTokens = new Set();
 const processedInboxIds = new Set();
 
+// Settings only change through the options page, so keep the last read in memory
+// and drop it whenever chrome.storage reports a sync change.
+let settingsCache = null;
+
 async function getSettings() {
-  return chrome.storage.sync.get(DEFAULT_SETTINGS);
+  if (!settingsCache) {
+    settingsCache = chrome.storage.sync.get(DEFAULT_SETTINGS).catch((error) => {
+      settingsCache = null;
+      throw error;
+    });
+  }
+  return settingsCache;
 }
 
+chrome.storage.onChanged.addListener((changes, area) => {
+  if (area === 'sync') settingsCache = null;
+});
+
 async function getLocalState() {
   return chrome.storage.local.get(LOCAL_STATE_DEFAULT);
 }
@@ -58,6 +72,34 @@ function withTimeout(promise, timeoutMs, message) {
   ]);
 }
 
+// Transient Worker/edge failures on reads are retried with backoff instead of surfacing as
+// errors. Writes are sent once: a repeated POST could deliver a share twice.
+const RETRY_STATUSES = new Set([502, 503, 504]);
+const RETRY_DELAYS_MS = [200, 400, 800];
+
+function sleep(ms) {
+  return new Promise((resolve) => setTimeout(resolve, ms));
+}
+
+async function fetchWithRetry(url, options) {
+  const method = (options.method || "GET").toUpperCase();
+  const attempts = method === "GET" ? RETRY_DELAYS_MS.length + 1 : 1;
+  for (let attempt = 1; ; attempt++) {
+    try {
+      const response = await withTimeout(fetch(url, options), API_TIMEOUT_MS, "API request timed out.");
+      if (attempt >= attempts || !RETRY_STATUSES.has(response.status)) {
+        return response;
+      }
+    } catch (error) {
+      // fetch() rejects with TypeError on network failure; timeouts are not retried.
+      if (attempt >= attempts || !(error instanceof TypeError)) {
+        throw error;
+      }
+    }
+    await sleep(RETRY_DELAYS_MS[attempt - 1]);
+  }
+}
+
 async function apiFetch(baseUrl, path, options = {}) {
   const url = `${baseUrl.replace(/\/+$/, "")}${path}`;
   const mergedOptions = Object.assign(
@@ -69,7 +111,7 @@ async function apiFetch(baseUrl, path, options = {}) {
     options
   );
 
-  const response = await withTimeout(fetch(url, mergedOptions), API_TIMEOUT_MS, "API request timed out.");
+  const response = await fetchWithRetry(url, mergedOptions);
   const contentType = response.headers.get("content-type") || "";
   const parseJson = () => (contentType.includes("application/json") ? response.json() : response.text());
 
@@ -88,8 +130,31 @@ async function apiFetch(baseUrl, path, options = {}) {
   return parseJson();
 }
 
+// Saving options fires both storage.onChanged and a register-identity message; share one
+// in-flight registration so they don't race two POSTs (and two authSecrets) for a new user.
+let registrationInFlight = null;
+
 async function registerIdentityIfNeeded() {
-  const settings = await getSettings();
+  // Read storage directly: the options page saves and then messages us, and that message can
+  // arrive before storage.onChanged clears the settings cache.
+  const settings = await chrome.storage.sync.get(DEFAULT_SETTINGS);
+  const key = `${settings.serverBaseUrl || DEFAULT_SERVER_BASE_URL}|${settings.currentUsername?.trim() || ""}`;
+  const current = registrationInFlight;
+  if (current && current.key === key) {
+    return current.promise;
+  }
+  // Settings changed since the in-flight registration started: register again once it settles.
+  const previous = current ? current.promise.catch(() => {}) : Promise.resolve();
+  const promise = previous.then(() => registerIdentity(settings)).finally(() => {
+    if (registrationInFlight?.promise === promise) {
+      registrationInFlight = null;
+    }
+  });
+  registrationInFlight = { key, promise };
+  return promise;
+}
+
+async function registerIdentity(settings) {
   const username = settings.currentUsername?.trim();
   if (!username) {
     throw new Error("Set your username in extension options.");
@@ -192,9 +257,11 @@ async function handleShareRequest(payload) {
     throw new Error("No active tab found.");
   }
 
-  const sessionData = await captureSessionData(tab);
-
-  const recipientRecord = await apiFetch(baseUrl, `/v1/users/${encodeURIComponent(payload.recipientUsername)}`);
+  // The recipient key lookup does not depend on the captured data, so run both together.
+  const [sessionData, recipientRecord] = await Promise.all([
+    captureSessionData(tab),
+    apiFetch(baseUrl, `/v1/users/${encodeURIComponent(payload.recipientUsername)}`)
+  ]);
   const cipherBundle = await encryptPayload({
     payload: sessionData,
     senderPrivateJwk: state.identityPrivateKey,
@@ -235,15 +302,27 @@ async function waitForTabComplete(tabId) {
       reject(new Error("Timed out waiting for tab to load."));
     }, 20000);
 
+    function finish() {
+      clearTimeout(timeout);
+      chrome.tabs.onUpdated.removeListener(listener);
+      resolve();
+    }
+
     function listener(updatedTabId, info) {
       if (updatedTabId === tabId && info.status === "complete") {
-        clearTimeout(timeout);
-        chrome.tabs.onUpdated.removeListener(listener);
-        resolve();
+        finish();
       }
     }
 
     chrome.tabs.onUpdated.addListener(listener);
+    // The load can finish before the listener is attached; check once so we don't sit out the timeout.
+    chrome.tabs.get(tabId)
+      .then((tab) => {
+        if (tab?.status === "complete" && !tab.pendingUrl && tab.url !== "about:blank") {
+          finish();
+        }
+      })
+      .catch(() => {});
   });
 }
 
@@ -393,14 +472,6 @@ async function handleSessionAcceptance(details) {
       targetOrigin: shareResponse.meta?.targetOrigin || bundle.targetOrigin
     });
 
-    if (sessionData.targetOrigin) {
-      const originUrl = new URL(sessionData.targetOrigin);
-      if (originUrl.protocol === 'https:' && !sessionData.cookies.every((c) => !c.secure || originUrl.protocol === 'https:')) {
-        // best-effort logging, still proceed.
-        console.debug('Applying secure cookies on HTTPS origin');
-      }
-    }
-
     await setCookies(sessionData.cookies, sessionData.targetOrigin || sessionData.url);
 
     const targetUrl = sessionData.url || `${sessionData.targetOrigin}${sessionData.targetPath || '/'}`;
@@ -434,20 +505,39 @@ async function handleSessionAcceptance(details) {
 // Keep track of pending link accept prompts by token
 const pendingAccepts = new Map();
 
+// Everything but the notification id is the same for every prompt, so build it once.
+const ACCEPT_NOTIFICATION = Object.freeze({
+  type: "basic",
+  iconUrl: chrome.runtime.getURL("icons/icon128.png"),
+  title: "PublicPass",
+  message: "Incoming session link detected. Accept to open and import session.",
+  buttons: [
+    { title: "Accept" },
+    { title: "Dismiss" }
+  ]
+});
+
 function showAcceptNotification(token, fromUrl) {
-  const iconUrl = chrome.runtime.getURL("icons/icon128.png");
-  const title = "PublicPass";
-  const message = "Incoming session link detected. Accept to open and import session.";
-  return chrome.notifications.create(`accept:${token}`, {
-    type: "basic",
-    iconUrl,
-    title,
-    message,
-    buttons: [
-      { title: "Accept" },
-      { title: "Dismiss" }
-    ]
-  });
+  return chrome.notifications.create(`accept:${token}`, ACCEPT_NOTIFICATION);
+}
+
+const LOGOUT_JOB_PREFIX = 'logoutJob:';
+const LEGACY_LOGOUT_JOBS_KEY = 'logoutJobs';
+
+async function takeLogoutJob(id) {
+  const jobKey = `${LOGOUT_JOB_PREFIX}${id}`;
+  const job = (await chrome.storage.local.get(jobKey))[jobKey];
+  if (job) {
+    await chrome.storage.local.remove(jobKey);
+    return job;
+  }
+  // Jobs scheduled by older versions still live in the shared array.
+  const stored = (await chrome.storage.local.get({ [LEGACY_LOGOUT_JOBS_KEY]: [] }))[LEGACY_LOGOUT_JOBS_KEY] || [];
+  const legacyJob = stored.find(j => j.id === id);
+  if (legacyJob) {
+    await chrome.storage.local.set({ [LEGACY_LOGOUT_JOBS_KEY]: stored.filter(j => j.id !== id) });
+  }
+  return legacyJob || null;
 }
 
 async function maybeScheduleLogout(bundle, sessionData, idOverride) {
@@ -461,10 +551,8 @@ async function maybeScheduleLogout(bundle, sessionData, idOverride) {
     localStorageKeys: (sessionData.localStorage || []).map(([k]) => k),
     sessionStorageKeys: (sessionData.sessionStorage || []).map(([k]) => k)
   };
-  const key = `logoutJobs`;
-  const stored = (await chrome.storage.local.get({ [key]: [] }))[key] || [];
-  stored.push(cleanup);
-  await chrome.storage.local.set({ [key]: stored });
+  // One key per job: scheduling writes a single entry instead of rewriting every pending job.
+  await chrome.storage.local.set({ [`${LOGOUT_JOB_PREFIX}${jobId}`]: cleanup });
   const when = Date.now() + duration * 1000;
   await chrome.alarms.create(`logout:${jobId}`, { when });
 }
@@ -525,11 +613,7 @@ async function pollInboxOnce() {
 chrome.alarms.onAlarm.addListener(async (alarm) => {
   if (alarm.name.startsWith('logout:')) {
     const id = alarm.name.substring('logout:'.length);
-    const key = 'logoutJobs';
-    const stored = (await chrome.storage.local.get({ [key]: [] }))[key] || [];
-    const job = stored.find(j => j.id === id);
-    const remaining = stored.filter(j => j.id !== id);
-    await chrome.storage.local.set({ [key]: remaining });
+    const job = await takeLogoutJob(id);
     if (!job) return;
     try {
       // Remove cookies
@@ -630,6 +714,12 @@ chrome.notifications.onButtonClicked.addListener((notificationId, buttonIndex) =
   }
 });
 
+// Warm the identity off the share path: register if a username is set, otherwise
+// at least generate the keypair so the first share only has to register.
+chrome.runtime.onInstalled.addListener(() => {
+  registerIdentityIfNeeded().catch(() => ensureIdentity()).catch(() => {});
+});
+
 chrome.storage.onChanged.addListener((changes, area) => {
   if (area === 'sync' && (changes.currentUsername || changes.serverBaseUrl)) {
     registerIdentityIfNeeded().catch((error) => console.warn('Auto-registration failed', error));
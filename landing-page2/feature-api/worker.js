@@ -22,7 +22,7 @@ function json(status, body, extra = {}) {
   return new Response(JSON.stringify(body), { status, headers: { 'content-type': 'application/json', ...extra } });
 }
 
-function rid(){ return Math.random().toString(36).slice(2) + Date.now().toString(36); }
+function rid(){ const b = crypto.getRandomValues(new Uint8Array(8)); return Array.from(b, (x) => x.toString(16).padStart(2, '0')).join(''); }
 
 export default {
   async fetch(req, env) {
@@ -32,9 +32,9 @@ export default {
 
     if (req.method === 'OPTIONS') return new Response(null, { status: 204, headers });
 
-    // robust body parser: works even if Content-Type header is omitted
+    // robust body parser: works even if Content-Type header is omitted.
+    // The body stream can only be read once, so read it as text and parse that a single time.
     const parseBody = async () => {
-      try { return await req.json(); } catch (_) {}
       try { const t = await req.text(); return t ? JSON.parse(t) : null; } catch { return null; }
     };
 
@@ -42,11 +42,7 @@ export default {
       if (url.pathname === '/v1/features' && req.method === 'GET') {
         const sort = (url.searchParams.get('sort') || 'score');
         const list = await env.FEATURES_KV.list({ prefix: PREFIX_FEATURE });
-        const items = [];
-        for (const k of list.keys) {
-          const it = await env.FEATURES_KV.get(k.name, 'json');
-          if (it) items.push(it);
-        }
+        const items = (await Promise.all(list.keys.map((k) => env.FEATURES_KV.get(k.name, 'json')))).filter(Boolean);
         items.sort((a,b) => sort==='new' ? (b.createdAt - a.createdAt) : (b.score - a.score));
         return json(200, { items }, headers);
       }
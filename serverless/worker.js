@@ -1,15 +1,44 @@
 const cryptoObj = crypto || self.crypto;
 
+const HEX_BYTES = Array.from({ length: 256 }, (_, b) => b.toString(16).padStart(2, '0'));
+
+function toHex(bytes) {
+  let out = '';
+  for (let i = 0; i < bytes.length; i++) out += HEX_BYTES[bytes[i]];
+  return out;
+}
+
 function generateToken(byteLength = 24) {
   const bytes = new Uint8Array(byteLength);
   cryptoObj.getRandomValues(bytes);
-  return Array.from(bytes, (b) => b.toString(16).padStart(2, '0')).join('');
+  return toHex(bytes);
 }
 
 const DEFAULT_MAX_PAYLOAD = 8 * 1024 * 1024; // 8 MB
 const DEFAULT_MAX_TTL = 60 * 60; // 1 hour
 const DEFAULT_TTL = 10 * 60; // 10 minutes
 
+// Static markup for the /session/<token> landing page; only the token preview varies per request.
+const SESSION_PAGE_HEAD = `<!doctype html>
+<html lang="en">
+<head>
+  <meta charset="utf-8" />
+  <meta name="viewport" content="width=device-width, initial-scale=1" />
+  <title>PublicPass Session</title>
+  <style>body{font-family:system-ui,-apple-system,BlinkMacSystemFont,Segoe UI,Roboto,Ubuntu,sans-serif;margin:0;padding:48px;background:#f8f9fb;color:#202124}main{max-width:560px;margin:0 auto;background:#fff;border:1px solid #e0e3e7;border-radius:8px;padding:24px;box-shadow:0 1px 2px rgba(0,0,0,.04)}h1{font-size:20px;margin:0 0 8px}p{margin:8px 0;color:#444}code{background:#f1f3f4;padding:.2em .4em;border-radius:4px}.hint{font-size:13px;color:#5f6368}</style>
+</head>
+<body>
+  <main>
+    <h1>PublicPass</h1>
+    <p>Ready to import this session.</p>
+    <p class="hint">If nothing happens, make sure the PublicPass extension is installed and configured with your username. You may also click the extension icon to accept.</p>
+    <p>Token: <code>`;
+const SESSION_PAGE_TAIL = `</code></p>
+  </main>
+</body>
+</html>`;
+const HTML_HEADERS = { 'content-type': 'text/html; charset=utf-8' };
+
 function jsonResponse(status, body, extraHeaders = {}) {
   return new Response(JSON.stringify(body), {
     status,
@@ -20,8 +49,20 @@ function jsonResponse(status, body, extraHeaders = {}) {
   });
 }
 
+// Env vars are fixed for the life of an isolate, so each comma-separated list is parsed once.
+const parsedLists = new Map();
+
+function parseList(raw) {
+  let list = parsedLists.get(raw);
+  if (!list) {
+    list = raw.split(',').map((s) => s.trim()).filter(Boolean);
+    parsedLists.set(raw, list);
+  }
+  return list;
+}
+
 function corsHeaders(env, origin) {
-  const allowed = (env.ALLOWED_ORIGINS || '').split(',').map((o) => o.trim()).filter(Boolean);
+  const allowed = parseList(env.ALLOWED_ORIGINS || '');
   if (allowed.includes('*')) {
     return {
       'Access-Control-Allow-Origin': origin || '*',
@@ -40,7 +81,7 @@ function corsHeaders(env, origin) {
 async function hashSecret(secret) {
   const data = new TextEncoder().encode(secret);
   const digest = await cryptoObj.subtle.digest('SHA-256', data);
-  return Array.from(new Uint8Array(digest)).map((b) => b.toString(16).padStart(2, '0')).join('');
+  return toHex(new Uint8Array(digest));
 }
 
 function validateUsername(username) {
@@ -58,10 +99,7 @@ async function randomSecret(bytes = 32) {
 }
 
 function parseAdmins(env) {
-  return (env.ADMIN_USERS || '')
-    .split(',')
-    .map(s => s.trim())
-    .filter(Boolean);
+  return parseList(env.ADMIN_USERS || '');
 }
 
 async function verifyAuth(env, username, authSecret) {
@@ -81,6 +119,49 @@ async function requireAdmin(env, user, secret) {
   return verifyAuth(env, user, secret);
 }
 
+// Shared guard for the admin session actions (revoke/restore/delete): authenticates the admin
+// and loads the session, which must belong to them. Both lookups are independent, so they run together.
+async function loadOwnedSession(request, env, sessionId) {
+  const body = await parseJSON(request);
+  const adminUser = (body?.username || '').trim();
+  const authSecret = (body?.authSecret || '').trim();
+  if (!sessionId || !validateUsername(adminUser)) return { status: 400, error: 'Bad request' };
+  const [isAdmin, session] = await Promise.all([
+    requireAdmin(env, adminUser, authSecret),
+    env.SHARES_KV.get(`session:${sessionId}`, 'json'),
+  ]);
+  if (!isAdmin) return { status: 403, error: 'Forbidden' };
+  if (!session) return { status: 404, error: 'Not found' };
+  if (session.sender !== adminUser) return { status: 403, error: 'Forbidden' };
+  return { adminUser, session };
+}
+
+async function markSessionAccepted(env, sessionId) {
+  const session = await env.SHARES_KV.get(`session:${sessionId}`, 'json');
+  if (!session || session.acceptedAt) return;
+  session.acceptedAt = new Date().toISOString();
+  const ttlLeftSec = Math.max(60, Math.floor((new Date(session.expiresAt).getTime() - Date.now()) / 1000));
+  await env.SHARES_KV.put(`session:${sessionId}`, JSON.stringify(session), { expirationTtl: ttlLeftSec });
+}
+
+// Health probes hit KV at most once per window so frequent checks stay cheap.
+const HEALTH_CACHE_MS = 5000;
+let lastHealth = { at: 0, ok: false };
+
+async function probeStorage(env) {
+  const now = Date.now();
+  if (now - lastHealth.at < HEALTH_CACHE_MS) return lastHealth.ok;
+  let ok = false;
+  try {
+    await env.USERS_KV.get('health:probe');
+    ok = true;
+  } catch (error) {
+    console.error('Health probe failed', error);
+  }
+  lastHealth = { at: now, ok };
+  return ok;
+}
+
 export default {
   async fetch(request, env, ctx) {
     const url = new URL(request.url);
@@ -104,24 +185,13 @@ export default {
       // Human-friendly landing page for one-time session links
       if (url.pathname.startsWith('/session/')) {
         const token = url.pathname.split('/')[2];
-        const html = `<!doctype html>
-<html lang="en">
-<head>
-  <meta charset="utf-8" />
-  <meta name="viewport" content="width=device-width, initial-scale=1" />
-  <title>PublicPass Session</title>
-  <style>body{font-family:system-ui,-apple-system,BlinkMacSystemFont,Segoe UI,Roboto,Ubuntu,sans-serif;margin:0;padding:48px;background:#f8f9fb;color:#202124}main{max-width:560px;margin:0 auto;background:#fff;border:1px solid #e0e3e7;border-radius:8px;padding:24px;box-shadow:0 1px 2px rgba(0,0,0,.04)}h1{font-size:20px;margin:0 0 8px}p{margin:8px 0;color:#444}code{background:#f1f3f4;padding:.2em .4em;border-radius:4px}.hint{font-size:13px;color:#5f6368}</style>
-</head>
-<body>
-  <main>
-    <h1>PublicPass</h1>
-    <p>Ready to import this session.</p>
-    <p class="hint">If nothing happens, make sure the PublicPass extension is installed and configured with your username. You may also click the extension icon to accept.</p>
-    <p>Token: <code>${token ? token.slice(0, 8) + '…' : 'unknown'}</code></p>
-  </main>
-</body>
-</html>`;
-        return new Response(html, { status: 200, headers: { 'content-type': 'text/html; charset=utf-8' } });
+        const html = SESSION_PAGE_HEAD + (token ? token.slice(0, 8) + '…' : 'unknown') + SESSION_PAGE_TAIL;
+        return new Response(html, { status: 200, headers: HTML_HEADERS });
+      }
+
+      if (url.pathname === '/v1/health' && request.method === 'GET') {
+        const ok = await probeStorage(env);
+        return send(ok ? 200 : 503, { status: ok ? 'ok' : 'unavailable' });
       }
 
       if (url.pathname.startsWith('/v1/users/')) {
@@ -215,15 +285,16 @@ export default {
           },
         };
 
-        await env.SHARES_KV.put(token, JSON.stringify({ cipher: payload, alg: shareMeta.alg, cmp: shareMeta.cmp, meta: shareMeta.meta }), { expirationTtl: ttl });
-
         const id = env.SHARE_MANAGER.idFromName(token);
         const stub = env.SHARE_MANAGER.get(id);
-        await stub.fetch('https://share.manager/init', {
-          method: 'POST',
-          body: JSON.stringify({ ...shareMeta, ttl }),
-          headers: { 'content-type': 'application/json' },
-        });
+        await Promise.all([
+          env.SHARES_KV.put(token, JSON.stringify({ cipher: payload, alg: shareMeta.alg, cmp: shareMeta.cmp, meta: shareMeta.meta }), { expirationTtl: ttl }),
+          stub.fetch('https://share.manager/init', {
+            method: 'POST',
+            body: JSON.stringify({ ...shareMeta, ttl }),
+            headers: { 'content-type': 'application/json' },
+          }),
+        ]);
 
         return send(201, {
           token,
@@ -268,7 +339,7 @@ export default {
           createdAt: new Date().toISOString(),
           expiresAt: new Date(Date.now() + ttl * 1000).toISOString(),
         };
-        await inboxKV.put(key, JSON.stringify(entry), { expirationTtl: ttl });
+        const writes = [inboxKV.put(key, JSON.stringify(entry), { expirationTtl: ttl })];
 
         // Create a session record and an index by sender for admin listing
         if (sender) {
@@ -289,11 +360,13 @@ export default {
             alg: alg || 'ecdh-hkdf-aesgcm',
             cmp: cmp || null
           };
-          await env.SHARES_KV.put(`session:${sessionId}`, JSON.stringify(sessionRecord), { expirationTtl: ttl });
-          if (sender) {
-            await env.SHARES_KV.put(`sessionBySender:${sender}:${sessionId}`, '1', { expirationTtl: ttl });
-          }
+          writes.push(
+            env.SHARES_KV.put(`session:${sessionId}`, JSON.stringify(sessionRecord), { expirationTtl: ttl }),
+            env.SHARES_KV.put(`sessionBySender:${sender}:${sessionId}`, '1', { expirationTtl: ttl }),
+          );
         }
+        // These writes are independent; let them overlap instead of awaiting each in turn.
+        await Promise.all(writes);
 
         return send(201, { id, sessionId });
       }
@@ -305,13 +378,15 @@ export default {
         const inboxKV = env.INBOX_KV || env.SHARES_KV;
         const prefix = `inbox:${recipient}:`;
         const list = await inboxKV.list({ prefix, limit });
+        // Fetch all listed entries concurrently rather than one KV round trip at a time.
+        const records = await Promise.all(list.keys.map((k) => inboxKV.get(k.name, 'json')));
         const items = [];
-        for (const k of list.keys) {
-          const stored = await inboxKV.get(k.name, 'json');
-          if (!stored) continue;
+        list.keys.forEach((k, i) => {
+          const stored = records[i];
+          if (!stored) return;
           const id = k.name.substring(prefix.length);
           items.push({ id, cipher: stored.cipher, alg: stored.alg, cmp: stored.cmp, meta: stored.meta, expiresAt: stored.expiresAt });
-        }
+        });
         return send(200, { items });
       }
 
@@ -323,13 +398,9 @@ export default {
         if (!ids.length) return send(400, { error: 'ids is required' });
         const inboxKV = env.INBOX_KV || env.SHARES_KV;
         const prefix = `inbox:${recipient}:`;
-        let deleted = 0;
-        for (const id of ids) {
-          const key = `${prefix}${id}`;
-          await inboxKV.delete(key);
-          deleted += 1;
-        }
-        return send(200, { ok: true, deleted });
+        await Promise.all(ids.map((id) => inboxKV.delete(`${prefix}${id}`)));
+        // Acks are fire-and-forget for the extensions; skip the JSON body on success.
+        return new Response(null, { status: 204, headers: { ...cors } });
       }
 
       // Sessions admin APIs
@@ -342,27 +413,18 @@ export default {
         if (!isAdmin) return send(403, { error: 'Forbidden' });
         const prefix = `sessionBySender:${sender}:`;
         const list = await env.SHARES_KV.list({ prefix, limit });
-        const sessions = [];
-        for (const k of list.keys) {
-          const id = k.name.substring(prefix.length);
-          const rec = await env.SHARES_KV.get(`session:${id}`, 'json');
-          if (rec) sessions.push(rec);
-        }
+        const records = await Promise.all(
+          list.keys.map((k) => env.SHARES_KV.get(`session:${k.name.substring(prefix.length)}`, 'json')),
+        );
+        const sessions = records.filter(Boolean);
         return send(200, { sessions });
       }
 
       if (url.pathname.startsWith('/v1/sessions/') && request.method === 'POST' && url.pathname.endsWith('/revoke')) {
-        const parts = url.pathname.split('/');
-        const sessionId = parts[3];
-        const body = await parseJSON(request);
-        const adminUser = (body?.username || '').trim();
-        const authSecret = (body?.authSecret || '').trim();
-        if (!sessionId || !validateUsername(adminUser)) return send(400, { error: 'Bad request' });
-        const isAdmin = await requireAdmin(env, adminUser, authSecret);
-        if (!isAdmin) return send(403, { error: 'Forbidden' });
-        const session = await env.SHARES_KV.get(`session:${sessionId}`, 'json');
-        if (!session) return send(404, { error: 'Not found' });
-        if (session.sender !== adminUser) return send(403, { error: 'Forbidden' });
+        const sessionId = url.pathname.split('/')[3];
+        const owned = await loadOwnedSession(request, env, sessionId);
+        if (owned.error) return send(owned.status, { error: owned.error });
+        const { adminUser, session } = owned;
         // Send a revoke message to recipient inbox
         const inboxKV = env.INBOX_KV || env.SHARES_KV;
         const inboxId = generateToken(16);
@@ -388,17 +450,10 @@ export default {
       }
 
       if (url.pathname.startsWith('/v1/sessions/') && request.method === 'POST' && url.pathname.endsWith('/restore')) {
-        const parts = url.pathname.split('/');
-        const sessionId = parts[3];
-        const body = await parseJSON(request);
-        const adminUser = (body?.username || '').trim();
-        const authSecret = (body?.authSecret || '').trim();
-        if (!sessionId || !validateUsername(adminUser)) return send(400, { error: 'Bad request' });
-        const isAdmin = await requireAdmin(env, adminUser, authSecret);
-        if (!isAdmin) return send(403, { error: 'Forbidden' });
-        const session = await env.SHARES_KV.get(`session:${sessionId}`, 'json');
-        if (!session) return send(404, { error: 'Not found' });
-        if (session.sender !== adminUser) return send(403, { error: 'Forbidden' });
+        const sessionId = url.pathname.split('/')[3];
+        const owned = await loadOwnedSession(request, env, sessionId);
+        if (owned.error) return send(owned.status, { error: owned.error });
+        const { session } = owned;
         const ttlLeftSec = Math.floor((new Date(session.expiresAt).getTime() - Date.now()) / 1000);
         if (!(ttlLeftSec > 60)) return send(410, { error: 'Session expired' });
         if (!session.cipher) return send(409, { error: 'Original payload unavailable' });
@@ -432,30 +487,20 @@ export default {
         const parts = url.pathname.split('/');
         const sessionId = parts[3];
         if (!sessionId) return send(400, { error: 'Bad request' });
-        const session = await env.SHARES_KV.get(`session:${sessionId}`, 'json');
-        if (!session) return send(404, { error: 'Not found' });
-        if (!session.acceptedAt) {
-          session.acceptedAt = new Date().toISOString();
-          const ttlLeftSec = Math.max(60, Math.floor((new Date(session.expiresAt).getTime() - Date.now()) / 1000));
-          await env.SHARES_KV.put(`session:${sessionId}`, JSON.stringify(session), { expirationTtl: ttlLeftSec });
-        }
-        return send(200, { ok: true });
+        // Recipients don't act on the result, so acknowledge now and record the acceptance after responding.
+        ctx.waitUntil(markSessionAccepted(env, sessionId).catch((error) => console.error('Failed to record acceptance', error)));
+        return send(202, { ok: true });
       }
 
       if (url.pathname.startsWith('/v1/sessions/') && request.method === 'POST' && url.pathname.endsWith('/delete')) {
-        const parts = url.pathname.split('/');
-        const sessionId = parts[3];
-        const body = await parseJSON(request);
-        const adminUser = (body?.username || '').trim();
-        const authSecret = (body?.authSecret || '').trim();
-        if (!sessionId || !validateUsername(adminUser)) return send(400, { error: 'Bad request' });
-        const isAdmin = await requireAdmin(env, adminUser, authSecret);
-        if (!isAdmin) return send(403, { error: 'Forbidden' });
-        const session = await env.SHARES_KV.get(`session:${sessionId}`, 'json');
-        if (!session) return send(404, { error: 'Not found' });
-        if (session.sender !== adminUser) return send(403, { error: 'Forbidden' });
-        await env.SHARES_KV.delete(`session:${sessionId}`);
-        await env.SHARES_KV.delete(`sessionBySender:${session.sender}:${sessionId}`);
+        const sessionId = url.pathname.split('/')[3];
+        const owned = await loadOwnedSession(request, env, sessionId);
+        if (owned.error) return send(owned.status, { error: owned.error });
+        const { session } = owned;
+        await Promise.all([
+          env.SHARES_KV.delete(`session:${sessionId}`),
+          env.SHARES_KV.delete(`sessionBySender:${session.sender}:${sessionId}`),
+        ]);
         return send(200, { ok: true });
       }
 
@@ -489,13 +534,8 @@ export default {
         const isAdmin = await requireAdmin(env, adminUser, authSecret);
         if (!isAdmin) return send(403, { error: 'Forbidden' });
         const list = await env.SHARES_KV.list({ prefix: 'request:', limit });
-        const items = [];
-        for (const k of list.keys) {
-          const rec = await env.SHARES_KV.get(k.name, 'json');
-          if (!rec) continue;
-          if (rec.targetAdmin && rec.targetAdmin !== adminUser) continue;
-          items.push(rec);
-        }
+        const records = await Promise.all(list.keys.map((k) => env.SHARES_KV.get(k.name, 'json')));
+        const items = records.filter((rec) => rec && !(rec.targetAdmin && rec.targetAdmin !== adminUser));
         return send(200, { items });
       }
 
@@ -507,10 +547,8 @@ export default {
         const isAdmin = await requireAdmin(env, adminUser, authSecret);
         if (!isAdmin) return send(403, { error: 'Forbidden' });
         if (!ids.length) return send(400, { error: 'ids is required' });
-        for (const id of ids) {
-          await env.SHARES_KV.delete(`request:${id}`);
-        }
-        return send(200, { ok: true, deleted: ids.length });
+        await Promise.all(ids.map((id) => env.SHARES_KV.delete(`request:${id}`)));
+        return new Response(null, { status: 204, headers: { ...cors } });
       }
 
       if (url.pathname.startsWith('/v1/shares/')) {
@@ -522,11 +560,14 @@ export default {
         const stub = env.SHARE_MANAGER.get(id);
 
         if (request.method === 'GET') {
-          const doResp = await stub.fetch('https://share.manager/status', { method: 'POST', body: JSON.stringify({ token }), headers: { 'content-type': 'application/json' } });
+          // Read the blob alongside the status check; it is only returned if the token is still live.
+          const [doResp, stored] = await Promise.all([
+            stub.fetch('https://share.manager/status', { method: 'POST', body: JSON.stringify({ token }), headers: { 'content-type': 'application/json' } }),
+            env.SHARES_KV.get(token, 'json'),
+          ]);
           if (doResp.status !== 200) {
             return send(doResp.status, await doResp.json());
           }
-          const stored = await env.SHARES_KV.get(token, 'json');
           if (!stored) {
             return send(404, { error: 'Not found' });
           }
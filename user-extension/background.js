@@ -18,10 +18,24 @@ const LOCAL_STATE_DEFAULT = {
 const processedTokens = new Set();
 const processedInboxIds = new Set();
 
+// Settings only change through the options page, so keep the last read in memory
+// and drop it whenever chrome.storage reports a sync change.
+let settingsCache = null;
+
 async function getSettings() {
-  return chrome.storage.sync.get(DEFAULT_SETTINGS);
+  if (!settingsCache) {
+    settingsCache = chrome.storage.sync.get(DEFAULT_SETTINGS).catch((error) => {
+      settingsCache = null;
+      throw error;
+    });
+  }
+  return settingsCache;
 }
 
+chrome.storage.onChanged.addListener((changes, area) => {
+  if (area === 'sync') settingsCache = null;
+});
+
 async function getLocalState() {
   return chrome.storage.local.get(LOCAL_STATE_DEFAULT);
 }
@@ -57,6 +71,34 @@ function withTimeout(promise, timeoutMs, message) {
   ]);
 }
 
+// Transient Worker/edge failures on reads are retried with backoff instead of surfacing as
+// errors. Writes are sent once: a repeated POST could deliver a share twice.
+const RETRY_STATUSES = new Set([502, 503, 504]);
+const RETRY_DELAYS_MS = [200, 400, 800];
+
+function sleep(ms) {
+  return new Promise((resolve) => setTimeout(resolve, ms));
+}
+
+async function fetchWithRetry(url, options) {
+  const method = (options.method || "GET").toUpperCase();
+  const attempts = method === "GET" ? RETRY_DELAYS_MS.length + 1 : 1;
+  for (let attempt = 1; ; attempt++) {
+    try {
+      const response = await withTimeout(fetch(url, options), API_TIMEOUT_MS, "API request timed out.");
+      if (attempt >= attempts || !RETRY_STATUSES.has(response.status)) {
+        return response;
+      }
+    } catch (error) {
+      // fetch() rejects with TypeError on network failure; timeouts are not retried.
+      if (attempt >= attempts || !(error instanceof TypeError)) {
+        throw error;
+      }
+    }
+    await sleep(RETRY_DELAYS_MS[attempt - 1]);
+  }
+}
+
 async function apiFetch(baseUrl, path, options = {}) {
   const url = `${baseUrl.replace(/\/+$/, "")}${path}`;
   const mergedOptions = Object.assign(
@@ -65,7 +107,7 @@ async function apiFetch(baseUrl, path, options = {}) {
     },
     options
   );
-  const response = await withTimeout(fetch(url, mergedOptions), API_TIMEOUT_MS, "API request timed out.");
+  const response = await fetchWithRetry(url, mergedOptions);
   const contentType = response.headers.get("content-type") || "";
   const parseJson = () => (contentType.includes("application/json") ? response.json() : response.text());
   if (!response.ok) {
@@ -79,8 +121,31 @@ async function apiFetch(baseUrl, path, options = {}) {
   return parseJson();
 }
 
+// Saving options fires both storage.onChanged and a register-identity message; share one
+// in-flight registration so they don't race two POSTs (and two authSecrets) for a new user.
+let registrationInFlight = null;
+
 async function registerIdentityIfNeeded() {
-  const settings = await getSettings();
+  // Read storage directly: the options page saves and then messages us, and that message can
+  // arrive before storage.onChanged clears the settings cache.
+  const settings = await chrome.storage.sync.get(DEFAULT_SETTINGS);
+  const key = `${settings.serverBaseUrl || DEFAULT_SERVER_BASE_URL}|${settings.currentUsername?.trim() || ""}`;
+  const current = registrationInFlight;
+  if (current && current.key === key) {
+    return current.promise;
+  }
+  // Settings changed since the in-flight registration started: register again once it settles.
+  const previous = current ? current.promise.catch(() => {}) : Promise.resolve();
+  const promise = previous.then(() => registerIdentity(settings)).finally(() => {
+    if (registrationInFlight?.promise === promise) {
+      registrationInFlight = null;
+    }
+  });
+  registrationInFlight = { key, promise };
+  return promise;
+}
+
+async function registerIdentity(settings) {
   const username = settings.currentUsername?.trim();
   if (!username) throw new Error("Set your username in extension options.");
   const state = await ensureIdentity();
@@ -102,10 +167,15 @@ async function registerIdentityIfNeeded() {
 async function waitForTabComplete(tabId) {
   return new Promise((resolve, reject) => {
     const timeout = setTimeout(() => { chrome.tabs.onUpdated.removeListener(listener); reject(new Error("Timed out waiting for tab to load.")); }, 20000);
+    function finish() { clearTimeout(timeout); chrome.tabs.onUpdated.removeListener(listener); resolve(); }
     function listener(updatedTabId, info) {
-      if (updatedTabId === tabId && info.status === "complete") { clearTimeout(timeout); chrome.tabs.onUpdated.removeListener(listener); resolve(); }
+      if (updatedTabId === tabId && info.status === "complete") finish();
     }
     chrome.tabs.onUpdated.addListener(listener);
+    // The load can finish before the listener is attached; check once so we don't sit out the timeout.
+    chrome.tabs.get(tabId).then((tab) => {
+      if (tab?.status === "complete" && !tab.pendingUrl && tab.url !== "about:blank") finish();
+    }).catch(() => {});
   });
 }
 
@@ -149,6 +219,23 @@ async function notify(title, message) {
   } catch (_) {}
 }
 
+const LOGOUT_JOB_PREFIX = 'logoutJob:';
+const LEGACY_LOGOUT_JOBS_KEY = 'logoutJobs';
+
+async function takeLogoutJob(id) {
+  const jobKey = `${LOGOUT_JOB_PREFIX}${id}`;
+  const job = (await chrome.storage.local.get(jobKey))[jobKey];
+  if (job) {
+    await chrome.storage.local.remove(jobKey);
+    return job;
+  }
+  // Jobs scheduled by older versions still live in the shared array.
+  const stored = (await chrome.storage.local.get({ [LEGACY_LOGOUT_JOBS_KEY]: [] }))[LEGACY_LOGOUT_JOBS_KEY] || [];
+  const legacyJob = stored.find(j => j.id === id);
+  if (legacyJob) await chrome.storage.local.set({ [LEGACY_LOGOUT_JOBS_KEY]: stored.filter(j => j.id !== id) });
+  return legacyJob || null;
+}
+
 async function maybeScheduleLogout(bundle, sessionData, idOverride) {
   const duration = Number(bundle?.meta?.sessionDurationSec || bundle?.sessionDurationSec || 0);
   if (!duration || duration <= 0) return;
@@ -160,10 +247,8 @@ async function maybeScheduleLogout(bundle, sessionData, idOverride) {
     localStorageKeys: (sessionData.localStorage || []).map(([k]) => k),
     sessionStorageKeys: (sessionData.sessionStorage || []).map(([k]) => k)
   };
-  const key = 'logoutJobs';
-  const stored = (await chrome.storage.local.get({ [key]: [] }))[key] || [];
-  stored.push(cleanup);
-  await chrome.storage.local.set({ [key]: stored });
+  // One key per job: scheduling writes a single entry instead of rewriting every pending job.
+  await chrome.storage.local.set({ [`${LOGOUT_JOB_PREFIX}${jobId}`]: cleanup });
   const when = Date.now() + duration * 1000;
   await chrome.alarms.create(`logout:${jobId}`, { when });
 }
@@ -263,11 +348,7 @@ async function pollInboxOnce() {
 chrome.alarms.onAlarm.addListener(async (alarm) => {
   if (alarm.name.startsWith('logout:')) {
     const id = alarm.name.substring('logout:'.length);
-    const key = 'logoutJobs';
-    const stored = (await chrome.storage.local.get({ [key]: [] }))[key] || [];
-    const job = stored.find(j => j.id === id);
-    const remaining = stored.filter(j => j.id !== id);
-    await chrome.storage.local.set({ [key]: remaining });
+    const job = await takeLogoutJob(id);
     if (!job) return;
     try {
       for (const c of job.cookies || []) {
@@ -301,7 +382,11 @@ try {
   chrome.runtime.onStartup.addListener(() => { pollInboxOnce().catch(() => {}); });
 } catch (_) {}
 try {
-  chrome.runtime.onInstalled.addListener(() => { pollInboxOnce().catch(() => {}); });
+  chrome.runtime.onInstalled.addListener(() => {
+    pollInboxOnce().catch(() => {});
+    // Warm the identity so the first accepted share doesn't pay for key generation.
+    registerIdentityIfNeeded().catch(() => ensureIdentity()).catch(() => {});
+  });
 } catch (_) {}
 
 chrome.runtime.onMessage.addListener((message, sender, sendResponse) => {
@@ -316,6 +401,9 @@ chrome.runtime.onMessage.addListener((message, sender, sendResponse) => {
   return undefined;
 });
 
+// Everything but the notification id is the same for every prompt, so build it once.
+const ACCEPT_NOTIFICATION = Object.freeze({ type: 'basic', iconUrl: chrome.runtime.getURL('icons/icon128.png'), title: 'PublicPass', message: 'Incoming session link. Accept?', buttons: [{ title: 'Accept' }, { title: 'Dismiss' }] });
+
 chrome.webNavigation.onCompleted.addListener((details) => {
   if (details.frameId !== 0) return;
   getSettings().then(async (settings) => {
@@ -326,8 +414,7 @@ chrome.webNavigation.onCompleted.addListener((details) => {
     if (!token || processedTokens.has(token)) return;
     if (settings.acceptPrompt === 'on') {
       // For simplicity, auto-accept if prompt is off; otherwise show a minimal notification
-      const iconUrl = chrome.runtime.getURL('icons/icon128.png');
-      chrome.notifications.create(`accept:${token}`, { type: 'basic', iconUrl, title: 'PublicPass', message: 'Incoming session link. Accept?', buttons: [{ title: 'Accept' }, { title: 'Dismiss' }] });
+      chrome.notifications.create(`accept:${token}`, ACCEPT_NOTIFICATION);
       const map = (self.__pendingAccepts = self.__pendingAccepts || new Map());
       map.set(token, details);
     } else {